@@ -1,86 +1,99 @@
-import sys
-from pathlib import Path
-
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+import os
+from types import MappingProxyType
 
 import pytest
 from fastapi.testclient import TestClient
 from app import app, activities
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+    """Create a single test client for the FastAPI app, shared across the session"""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
-@pytest.fixture
-def reset_activities():
-    """Reset activities to initial state before each test"""
-    initial_state = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Soccer Team": {
-            "description": "Join the school soccer team and compete in matches",
-            "schedule": "Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 22,
-            "participants": ["lucas@mergington.edu", "mia@mergington.edu"]
-        },
-        "Basketball Club": {
-            "description": "Practice basketball skills and play friendly games",
-            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["liam@mergington.edu", "ava@mergington.edu"]
-        },
-        "Art Workshop": {
-            "description": "Explore painting, drawing, and sculpture techniques",
-            "schedule": "Mondays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["ella@mergington.edu", "noah@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Act, direct, and produce school plays and performances",
-            "schedule": "Fridays, 3:30 PM - 5:30 PM",
-            "max_participants": 20,
-            "participants": ["jack@mergington.edu", "grace@mergington.edu"]
-        },
-        "Math Olympiad": {
-            "description": "Prepare for math competitions and solve challenging problems",
-            "schedule": "Tuesdays, 4:00 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["henry@mergington.edu", "chloe@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Thursdays, 4:00 PM - 5:00 PM",
-            "max_participants": 14,
-            "participants": ["ben@mergington.edu", "zoe@mergington.edu"]
-        }
+# Initial activities state, restored after each test
+initial_state = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Soccer Team": {
+        "description": "Join the school soccer team and compete in matches",
+        "schedule": "Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 22,
+        "participants": ["lucas@mergington.edu", "mia@mergington.edu"]
+    },
+    "Basketball Club": {
+        "description": "Practice basketball skills and play friendly games",
+        "schedule": "Thursdays, 3:30 PM - 5:00 PM",
+        "max_participants": 15,
+        "participants": ["liam@mergington.edu", "ava@mergington.edu"]
+    },
+    "Art Workshop": {
+        "description": "Explore painting, drawing, and sculpture techniques",
+        "schedule": "Mondays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["ella@mergington.edu", "noah@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Act, direct, and produce school plays and performances",
+        "schedule": "Fridays, 3:30 PM - 5:30 PM",
+        "max_participants": 20,
+        "participants": ["jack@mergington.edu", "grace@mergington.edu"]
+    },
+    "Math Olympiad": {
+        "description": "Prepare for math competitions and solve challenging problems",
+        "schedule": "Tuesdays, 4:00 PM - 5:00 PM",
+        "max_participants": 16,
+        "participants": ["henry@mergington.edu", "chloe@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore scientific concepts",
+        "schedule": "Thursdays, 4:00 PM - 5:00 PM",
+        "max_participants": 14,
+        "participants": ["ben@mergington.edu", "zoe@mergington.edu"]
     }
-    
-    # Clear and reset activities
-    activities.clear()
-    activities.update(initial_state)
-    
+}
+
+# Read-only baseline; only the participants lists need copying on restore
+_FROZEN = {
+    name: MappingProxyType({**details, "participants": tuple(details["participants"])})
+    for name, details in initial_state.items()
+}
+
+
+def _restore_activities():
+    # Drop extra activities, then overwrite the rest without an empty interim state
+    for name in activities.keys() - _FROZEN.keys():
+        del activities[name]
+    activities.update({
+        name: {**details, "participants": list(details["participants"])}
+        for name, details in _FROZEN.items()
+    })
+
+
+@pytest.fixture
+def reset_activities(request):
+    """Reset activities to initial state after each test"""
     yield
-    
-    # Reset after test
-    activities.clear()
-    activities.update(initial_state)
+    # Nothing runs after the last test of a serial session; xdist workers
+    # may still receive more tests, so always restore there
+    is_last = request.node is request.session.items[-1]
+    if not is_last or "PYTEST_XDIST_WORKER" in os.environ:
+        _restore_activities()
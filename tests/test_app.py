@@ -1,7 +1,25 @@
 """Tests for the Mergington High School Activities API"""
 
+import asyncio
+
+import httpx
 import pytest
 
+from app import app, activities
+
+SIGNUP_URL = "/activities/{activity}/signup".format
+UNREGISTER_URL = "/activities/{activity}/unregister".format
+
+
+def get_activity(client, name):
+    """Fetch /activities once and return the details of a single activity"""
+    return client.get("/activities").json()[name]
+
+
+def participants_of(activities_dict, name):
+    """Return the participants of an activity as a set for membership checks"""
+    return set(activities_dict[name]["participants"])
+
 
 class TestRootEndpoint:
     """Test the root endpoint"""
@@ -13,10 +31,11 @@ class TestRootEndpoint:
         assert "/static/index.html" in response.headers["location"]
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestActivitiesEndpoint:
     """Test the /activities endpoint"""
     
-    def test_get_activities(self, client, reset_activities):
+    def test_get_activities(self, client):
         """Test getting all activities"""
         response = client.get("/activities")
         assert response.status_code == 200
@@ -27,184 +46,145 @@ class TestActivitiesEndpoint:
         assert "Programming Class" in data
         assert len(data) == 9
     
-    def test_get_activities_structure(self, client, reset_activities):
+    def test_get_activities_structure(self, client):
         """Test that activities have correct structure"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        activity = data["Chess Club"]
+        activity = get_activity(client, "Chess Club")
         assert "description" in activity
         assert "schedule" in activity
         assert "max_participants" in activity
         assert "participants" in activity
         assert isinstance(activity["participants"], list)
     
-    def test_activities_contain_participants(self, client, reset_activities):
+    def test_activities_contain_participants(self, client):
         """Test that activities contain the expected participants"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        assert "michael@mergington.edu" in data["Chess Club"]["participants"]
-        assert "daniel@mergington.edu" in data["Chess Club"]["participants"]
+        participants = get_activity(client, "Chess Club")["participants"]
+        assert "michael@mergington.edu" in participants
+        assert "daniel@mergington.edu" in participants
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestSignupEndpoint:
     """Test the /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client, reset_activities):
-        """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=newstudent@mergington.edu"
-        )
+    @pytest.mark.parametrize("activity,email", [
+        ("Chess Club", "newstudent@mergington.edu"),
+        ("Programming Class", "coder@mergington.edu"),
+        ("Art Workshop", "painter@mergington.edu"),
+    ])
+    def test_signup_adds_participant(self, client, activity, email):
+        """Test that signup succeeds and actually adds the participant"""
+        response = client.post(SIGNUP_URL(activity=activity), params={"email": email})
         assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
-    
-    def test_signup_adds_participant(self, client, reset_activities):
-        """Test that signup actually adds the participant"""
-        email = "newstudent@mergington.edu"
-        client.post(f"/activities/Chess%20Club/signup?email={email}")
+        assert email in response.json()["message"]
         
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Chess Club"]["participants"]
-    
-    def test_signup_duplicate_student(self, client, reset_activities):
-        """Test that a student cannot sign up twice for the same activity"""
-        email = "michael@mergington.edu"  # Already in Chess Club
-        response = client.post(f"/activities/Chess%20Club/signup?email={email}")
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert "already signed up" in data["detail"].lower()
-    
-    def test_signup_invalid_activity(self, client, reset_activities):
-        """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/NonexistentActivity/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
+        assert email in participants_of(activities, activity)
     
-    def test_signup_multiple_activities(self, client, reset_activities):
+    def test_signup_multiple_activities(self, client):
         """Test that a student can sign up for multiple activities"""
         email = "newstudent@mergington.edu"
         
         # Sign up for Chess Club
-        response1 = client.post(f"/activities/Chess%20Club/signup?email={email}")
+        response1 = client.post(SIGNUP_URL(activity="Chess Club"), params={"email": email})
         assert response1.status_code == 200
         
         # Sign up for Programming Class
-        response2 = client.post(f"/activities/Programming%20Class/signup?email={email}")
+        response2 = client.post(SIGNUP_URL(activity="Programming Class"), params={"email": email})
         assert response2.status_code == 200
         
         # Verify both signups
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Chess Club"]["participants"]
-        assert email in data["Programming Class"]["participants"]
+        assert email in participants_of(activities, "Chess Club")
+        assert email in participants_of(activities, "Programming Class")
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestUnregisterEndpoint:
     """Test the /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_success(self, client, reset_activities):
-        """Test successful unregistration from an activity"""
-        email = "michael@mergington.edu"
-        response = client.post(
-            f"/activities/Chess%20Club/unregister?email={email}"
-        )
+    @pytest.mark.parametrize("activity,email", [
+        ("Chess Club", "michael@mergington.edu"),
+        ("Programming Class", "emma@mergington.edu"),
+        ("Art Workshop", "ella@mergington.edu"),
+    ])
+    def test_unregister_removes_participant(self, client, activity, email):
+        """Test that unregister succeeds and actually removes the participant"""
+        response = client.post(UNREGISTER_URL(activity=activity), params={"email": email})
         assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "Unregistered" in data["message"]
-    
-    def test_unregister_removes_participant(self, client, reset_activities):
-        """Test that unregister actually removes the participant"""
-        email = "michael@mergington.edu"
-        client.post(f"/activities/Chess%20Club/unregister?email={email}")
+        assert "Unregistered" in response.json()["message"]
         
         # Verify participant was removed
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Chess Club"]["participants"]
-    
-    def test_unregister_not_signed_up(self, client, reset_activities):
-        """Test unregistering a student who is not signed up"""
-        email = "notstudent@mergington.edu"
-        response = client.post(
-            f"/activities/Chess%20Club/unregister?email={email}"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "not signed up" in data["detail"].lower()
+        assert email not in participants_of(activities, activity)
     
-    def test_unregister_invalid_activity(self, client, reset_activities):
-        """Test unregistration from non-existent activity"""
-        response = client.post(
-            "/activities/NonexistentActivity/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "not found" in data["detail"].lower()
-    
-    def test_signup_then_unregister(self, client, reset_activities):
+    def test_signup_then_unregister(self, client):
         """Test signup followed by unregister"""
         email = "newstudent@mergington.edu"
         
         # Sign up
-        response1 = client.post(f"/activities/Chess%20Club/signup?email={email}")
+        response1 = client.post(SIGNUP_URL(activity="Chess Club"), params={"email": email})
         assert response1.status_code == 200
         
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Chess Club"]["participants"]
+        assert email in participants_of(activities, "Chess Club")
         
         # Unregister
-        response2 = client.post(f"/activities/Chess%20Club/unregister?email={email}")
+        response2 = client.post(UNREGISTER_URL(activity="Chess Club"), params={"email": email})
         assert response2.status_code == 200
         
         # Verify participant was removed
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Chess Club"]["participants"]
+        assert email not in participants_of(activities, "Chess Club")
 
 
+@pytest.mark.usefixtures("reset_activities")
+class TestErrorResponses:
+    """Test error responses from the signup and unregister endpoints"""
+    
+    @pytest.mark.parametrize("url,email,expected_status,detail_substring", [
+        (SIGNUP_URL(activity="Chess Club"), "michael@mergington.edu", 400, "already signed up"),
+        (SIGNUP_URL(activity="NonexistentActivity"), "student@mergington.edu", 404, "not found"),
+        (UNREGISTER_URL(activity="Chess Club"), "notstudent@mergington.edu", 400, "not signed up"),
+        (UNREGISTER_URL(activity="NonexistentActivity"), "student@mergington.edu", 404, "not found"),
+    ], ids=[
+        "signup-duplicate",
+        "signup-missing-activity",
+        "unregister-not-signed-up",
+        "unregister-missing-activity",
+    ])
+    def test_error_responses(self, client, url, email, expected_status, detail_substring):
+        """Test that invalid requests return the expected status and detail"""
+        response = client.post(url, params={"email": email})
+        assert response.status_code == expected_status
+        assert detail_substring in response.json()["detail"].lower()
+
+
+@pytest.mark.usefixtures("reset_activities")
 class TestIntegration:
     """Integration tests for multiple operations"""
     
-    def test_availability_updates(self, client, reset_activities):
+    def test_availability_updates(self, client):
         """Test that availability spot count updates correctly"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        initial_spots = data["Chess Club"]["max_participants"] - len(data["Chess Club"]["participants"])
+        chess = get_activity(client, "Chess Club")
+        initial_spots = chess["max_participants"] - len(chess["participants"])
         
         # Sign up
-        client.post("/activities/Chess%20Club/signup?email=newstudent@mergington.edu")
+        client.post(SIGNUP_URL(activity="Chess Club"), params={"email": "newstudent@mergington.edu"})
         
-        response = client.get("/activities")
-        data = response.json()
-        new_spots = data["Chess Club"]["max_participants"] - len(data["Chess Club"]["participants"])
+        chess = get_activity(client, "Chess Club")
+        new_spots = chess["max_participants"] - len(chess["participants"])
         
         assert new_spots == initial_spots - 1
     
-    def test_concurrent_signups(self, client, reset_activities):
-        """Test multiple signups for the same activity"""
+    @pytest.mark.asyncio
+    async def test_concurrent_signups(self):
+        """Test multiple concurrent signups for the same activity"""
         emails = [f"student{i}@mergington.edu" for i in range(3)]
         
-        for email in emails:
-            response = client.post(f"/activities/Art%20Workshop/signup?email={email}")
-            assert response.status_code == 200
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = await asyncio.gather(*[
+                ac.post(SIGNUP_URL(activity="Art Workshop"), params={"email": email})
+                for email in emails
+            ])
+        assert all(response.status_code == 200 for response in responses)
         
         # Verify all were added
-        response = client.get("/activities")
-        data = response.json()
-        for email in emails:
-            assert email in data["Art Workshop"]["participants"]
+        assert set(emails) <= participants_of(activities, "Art Workshop")